@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import logging
-from distutils.version import LooseVersion
 from string import Template
 import datetime
 import json
@@ -155,7 +154,7 @@ class Checker:
         """
         Parse version string and return a dict of named components.
         """
-        version_list = LooseVersion(version).version
+        version_list = utils.loose_version_parts(version)
         tmpl_vars: t.Dict[str, t.Union[str, int]]
         tmpl_vars = {"version": version}
         for i, version_part in enumerate(version_list):
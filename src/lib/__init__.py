@@ -15,7 +15,7 @@ USER_AGENT = (
 
 HTTP_CLIENT_HEADERS = {"User-Agent": USER_AGENT}
 
-HTTP_CHUNK_SIZE = 1024 * 64
+HTTP_CHUNK_SIZE = 1024 * 1024
 
 NETWORK_ERRORS = (
     aiohttp.ClientError,
@@ -20,26 +20,29 @@
 
 import apt_inst
 import apt_pkg
+import configparser
 import datetime as dt
 import zoneinfo
 import json
 import logging
+import io
 import os
 import re
 import subprocess
+import tarfile
 import tempfile
 import urllib.request
 import urllib.parse
 import typing as t
-from distutils.version import StrictVersion, LooseVersion
 import asyncio
 import shlex
 from pathlib import Path
 import operator
+import functools
 
-from collections import OrderedDict
 from ruamel.yaml import YAML
 from elftools.elf.elffile import ELFFile
+from packaging.version import Version as PackagingVersion
 import aiohttp
 import editorconfig
 import magic
@@ -51,21 +54,97 @@ from .checksums import MultiHash
 import gi
 
 gi.require_version("Json", "1.0")
-from gi.repository import GLib, Json  # noqa: E402
+from gi.repository import Json  # noqa: E402
 
 log = logging.getLogger(__name__)
 
 
+@functools.cache
+def _mime_magic() -> magic.Magic:
+    # Loading the magic database is comparatively expensive, so share a single
+    # cookie between all downloads rather than reinitialising it for each one,
+    # but don't pay for it until something actually needs sniffing
+    return magic.Magic(mime=True)
+
+
 def _extract_timestamp(info):
     date_str = info.get("Last-Modified") or info.get("Date")
     return parse_date_header(date_str)
 
 
+_HTTP_DATE_PATTERN = re.compile(
+    r"""
+        ^(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun),\s
+        (?P<day>\d{1,2})(?P<sep>[-\s])(?P<month>[A-Z][a-z]{2})(?P=sep)(?P<year>\d{4})\s
+        (?P<hour>\d{1,2}):(?P<minute>\d{1,2}):(?P<second>\d{1,2})\s
+        (?:
+            (?P<utc>GMT|UTC)
+            |(?P<sign>[+-])(?P<tzhour>\d{2})(?P<tzminute>\d{2})
+        )$
+    """,
+    re.VERBOSE,
+)
+_HTTP_DATE_MONTHS = {
+    name: number
+    for number, name in enumerate(
+        "Jan Feb Mar Apr May Jun Jul Aug Sep Oct Nov Dec".split(), start=1
+    )
+}
+
+
+def _parse_http_date(date_str: str) -> t.Optional[dt.datetime]:
+    """Parse the common forms of HTTP date with a single regex match, returning
+    the same result as the equivalent strptime() format would, or None for
+    anything else."""
+    m = _HTTP_DATE_PATTERN.match(date_str)
+    if m is None:
+        return None
+    month = _HTTP_DATE_MONTHS.get(m.group("month"))
+    if month is None:
+        return None
+
+    tzinfo: t.Optional[dt.tzinfo]
+    if m.group("utc"):
+        # strptime()'s %Z accepts the name but doesn't set tzinfo
+        tzinfo = None
+    else:
+        offset = dt.timedelta(
+            hours=int(m.group("tzhour")), minutes=int(m.group("tzminute"))
+        )
+        tzinfo = dt.timezone(-offset if m.group("sign") == "-" else offset)
+
+    try:
+        return dt.datetime(
+            int(m.group("year")),
+            month,
+            int(m.group("day")),
+            int(m.group("hour")),
+            int(m.group("minute")),
+            int(m.group("second")),
+            tzinfo=tzinfo,
+        )
+    except ValueError:
+        return None
+
+
 def parse_date_header(date_str):
     """Parse a stringified date, from a Last-Modified or Date header.
 
     In addition to standard(ish) formats, non-standard formats where the
     timezone is a named zone rather than an offset are detected and handled."""
+    if not date_str:
+        return dt.datetime.now()  # what else can we do?
+    return _parse_date_header(date_str)
+
+
+# Servers behind the same CDN tend to send identical dates, and the fallback
+# for named timezones walks the whole tz database, so remember the results
+@functools.lru_cache(maxsize=256)
+def _parse_date_header(date_str: str):
+    parsed = _parse_http_date(date_str)
+    if parsed is not None:
+        return parsed
+
     for tz in zoneinfo.available_timezones():
         if tz in ("UTC", "GMT") or not date_str.endswith(tz):
             continue
@@ -98,38 +177,62 @@ def parse_date_header(date_str):
             continue
         raise CheckerRemoteError(f"Cannot parse date/time: {date_str}")
 
-    if not date_str:
-        return dt.datetime.now()  # what else can we do?
-
 
-def _check_newline(fp):
-    original_position = fp.tell()
-    fp.seek(0, os.SEEK_END)
-    fp.seek(fp.tell() - 1, os.SEEK_SET)
-    last_char = fp.read()
-    fp.seek(original_position, os.SEEK_SET)
-    if last_char == "\n":
-        return True
-    else:
-        return False
+def _check_newline(path: t.Union[Path, str]) -> bool:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        if size == 0:
+            return False
+        return os.pread(fd, 1, size - 1) == b"\n"
+    finally:
+        os.close(fd)
 
 
 def strip_query(url):
     """Sanitizes the query string from the given URL, if any. Parameters whose
     names begin with an underscore are assumed to be tracking identifiers and
     are removed."""
-    parts = urllib.parse.urlparse(url)
-    if not parts.query:
+    parts = urllib.parse.urlsplit(url)
+    if "_" not in parts.query:
         return url
-    qsl = urllib.parse.parse_qsl(parts.query)
-    qsl_stripped = [(k, v) for (k, v) in qsl if not k.startswith("_")]
-    query_stripped = urllib.parse.urlencode(qsl_stripped)
-    stripped = urllib.parse.urlunparse(parts._replace(query=query_stripped))
+    # Filter the raw parameters, so the ones that are kept stay encoded
+    # exactly as the server sent them
+    params = parts.query.split("&")
+    params_stripped = [p for p in params if not p.startswith("_")]
+    if len(params_stripped) == len(params):
+        return url
+    query_stripped = "&".join(params_stripped)
+    stripped = urllib.parse.urlunsplit(parts._replace(query=query_stripped))
     log.debug("Normalised %s to %s", url, stripped)
     return stripped
 
 
+@functools.lru_cache(maxsize=None)
+def _combine_patterns(patterns: t.Tuple[re.Pattern, ...]) -> t.Optional[re.Pattern]:
+    """Merge 'patterns' into a single alternation, so that a string can be
+    checked against all of them with one match.
+
+    Returns None if there are no patterns, they don't all share the same flags
+    or they can't be joined (e.g. because of inline global flags), in which
+    case they have to be matched one by one."""
+    flags = {p.flags for p in patterns}
+    if len(flags) != 1:
+        return None
+    try:
+        return re.compile("|".join(f"(?:{p.pattern})" for p in patterns), flags.pop())
+    except re.error:
+        return None
+
+
 async def get_timestamp_from_url(url: str, session: aiohttp.ClientSession):
+    """
+    Get the Last-Modified timestamp of `url` with a HEAD request.
+
+    Only for sources whose checksums are known without downloading them;
+    get_extra_data_info_from_url() already sets the timestamp from the
+    response it downloads.
+    """
     async with session.head(url, allow_redirects=True) as response:
         return _extract_timestamp(response.headers)
 
@@ -148,33 +251,51 @@ async def get_extra_data_info_from_url(
         real_url = str(response.url)
         info = response.headers
 
+        deny_patterns = tuple(content_type_deny or ())
+        deny_re = _combine_patterns(deny_patterns)
+
         def content_type_rejected(content_type: t.Optional[str]) -> bool:
-            return (
-                content_type is not None
-                and content_type_deny is not None
-                and any(r.match(content_type) for r in content_type_deny)
-            )
+            if content_type is None:
+                return False
+            if deny_re is not None:
+                return deny_re.match(content_type) is not None
+            return any(r.match(content_type) for r in deny_patterns)
 
         checksum = MultiHash()
         first_chunk = True
         size = 0
-        async for chunk in response.content.iter_chunked(HTTP_CHUNK_SIZE):
-            if first_chunk:
-                first_chunk = False
-                # determine content type from magic number since http header may be
-                # wrong
-                actual_content_type = magic.from_buffer(chunk, mime=True)
-                if content_type_rejected(actual_content_type):
-                    raise CheckerFetchError(
-                        f"Wrong content type '{actual_content_type}' received "
-                        f"from '{url}'"
-                    )
 
+        def consume(chunk: bytes):
             checksum.update(chunk)
-            size += len(chunk)
             if dest_io is not None:
                 dest_io.write(chunk)
 
+        # Hash and store each chunk in a worker thread while the next one is
+        # being received; hashlib releases the GIL for large buffers, so the
+        # two genuinely overlap. Only one chunk is in flight at a time, which
+        # keeps them in order and bounds memory use.
+        pending: t.Optional[asyncio.Future] = None
+        try:
+            async for chunk in response.content.iter_chunked(HTTP_CHUNK_SIZE):
+                if first_chunk:
+                    first_chunk = False
+                    # determine content type from magic number since http header
+                    # may be wrong
+                    actual_content_type = _mime_magic().from_buffer(chunk)
+                    if content_type_rejected(actual_content_type):
+                        raise CheckerFetchError(
+                            f"Wrong content type '{actual_content_type}' received "
+                            f"from '{url}'"
+                        )
+
+                size += len(chunk)
+                if pending is not None:
+                    await pending
+                pending = asyncio.ensure_future(asyncio.to_thread(consume, chunk))
+        finally:
+            if pending is not None:
+                await pending
+
     external_file = externaldata.ExternalFile(
         url=strip_query(real_url if follow_redirects else url),
         checksum=checksum.hexdigest(),
@@ -193,17 +314,50 @@ class VersionComparisonError(CheckerQueryError):
         super().__init__(f"Can't compare {self.left} and {self.right}")
 
 
+# Versions that the old distutils StrictVersion accepted: two or three
+# numeric components with an optional alpha/beta suffix.  PEP 440 orders
+# these the same way StrictVersion did
+_STRICT_VERSION_RE = re.compile(r"^\d+\.\d+(\.\d+)?([ab]\d+)?$", re.ASCII)
+# Components as split out by distutils LooseVersion: runs of digits, runs of
+# lowercase letters, and runs of anything else except the dots between them
+_LOOSE_VERSION_COMPONENT_RE = re.compile(r"(\d+)|([a-z]+|[^\da-z.]+)")
+
+LooseVersionParts = t.Tuple[t.Union[int, str], ...]
+
+
+# The same version strings get compared over and over again while filtering
+# and sorting, so remember how they parse
+@functools.lru_cache(maxsize=4096)
+def _parse_strict_version(version: str) -> t.Optional[PackagingVersion]:
+    if not _STRICT_VERSION_RE.match(version):
+        return None
+    return PackagingVersion(version)
+
+
+@functools.lru_cache(maxsize=4096)
+def loose_version_parts(version: str) -> LooseVersionParts:
+    """
+    Split a version string into numeric and alphabetic components,
+    e.g. "1.2rc3" becomes (1, 2, "rc", 3).
+    """
+    return tuple(
+        int(number) if number else other
+        for number, other in _LOOSE_VERSION_COMPONENT_RE.findall(version)
+    )
+
+
 class FallbackVersion(t.NamedTuple):
     s: str
 
     def __compare(self, oper, other) -> bool:
+        self_strict = _parse_strict_version(self.s)
+        other_strict = _parse_strict_version(other.s)
+        if self_strict is not None and other_strict is not None:
+            return oper(self_strict, other_strict)
         try:
-            return oper(StrictVersion(self.s), StrictVersion(other.s))
-        except ValueError:
-            try:
-                return oper(LooseVersion(self.s), LooseVersion(other.s))
-            except TypeError as err:
-                raise VersionComparisonError(self.s, other.s) from err
+            return oper(loose_version_parts(self.s), loose_version_parts(other.s))
+        except TypeError as err:
+            raise VersionComparisonError(self.s, other.s) from err
 
     def __lt__(self, other):
         return self.__compare(operator.lt, other)
@@ -238,26 +392,26 @@ def filter_versioned_items(
     to_version: t.Callable[[_VersionedObj], _ComparableObj],
     sort=False,
 ) -> t.List[_VersionedObj]:
-    constraints = list(constraints)
+    constraints_opers = [(OPERATORS[o], limit) for o, limit in constraints]
+    # Keep each item's version alongside it so sorting doesn't recompute it
     new_items = []
     for item in items:
         version = to_version(item)
-        matches = []
-        for oper_str, version_limit in constraints:
-            oper = OPERATORS[oper_str]
+        for oper, version_limit in constraints_opers:
             try:
                 match = oper(version, version_limit)
             except VersionComparisonError as err:
                 log.debug(err)
                 match = False
-            matches.append(match)
-        if all(matches):
-            new_items.append(item)
+            if not match:
+                break
+        else:
+            new_items.append((version, item))
 
     if sort:
-        return sorted(new_items, key=to_version)
+        new_items.sort(key=operator.itemgetter(0))
 
-    return new_items
+    return [item for _, item in new_items]
 
 
 def filter_versions(
@@ -273,31 +427,54 @@ def filter_versions(
     )
 
 
+_BWRAP_PREFIX = (
+    "bwrap",
+    "--unshare-all",
+    "--dev",
+    "/dev",
+    *(
+        arg
+        for path in ("/usr", "/lib", "/lib64", "/bin", "/proc")
+        for arg in ("--ro-bind", path, path)
+    ),
+)
+
+
 def wrap_in_bwrap(cmdline, bwrap_args=None):
-    bwrap_cmd = ["bwrap", "--unshare-all", "--dev", "/dev"]
-    for path in ("/usr", "/lib", "/lib64", "/bin", "/proc"):
-        bwrap_cmd.extend(["--ro-bind", path, path])
-    if bwrap_args is not None:
-        bwrap_cmd.extend(bwrap_args)
-    return bwrap_cmd + ["--"] + cmdline
+    return [*_BWRAP_PREFIX, *(bwrap_args or ()), "--", *cmdline]
+
+
+# Whether bwrap works, once it has been probed. This doesn't change over the
+# lifetime of the process, so it is only checked once.
+_BWRAP_AVAILABLE: t.Optional[bool] = None
 
 
-def check_bwrap():
+def check_bwrap() -> bool:
+    global _BWRAP_AVAILABLE
+    if _BWRAP_AVAILABLE is not None:
+        return _BWRAP_AVAILABLE
+
     try:
         subprocess.run(
             wrap_in_bwrap(["/bin/true"]),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             check=True,
         )
     except FileNotFoundError as err:
         log.debug("bwrap unavailable: %s", err)
-        return False
+        _BWRAP_AVAILABLE = False
     except subprocess.CalledProcessError as err:
-        log.debug("bwrap unavailable: %s", err.output.strip())
-        return False
-    return True
+        log.debug("bwrap unavailable: %s", err.stderr.decode().strip())
+        _BWRAP_AVAILABLE = False
+    else:
+        _BWRAP_AVAILABLE = True
+    return _BWRAP_AVAILABLE
+
+
+async def check_bwrap_async() -> bool:
+    return await asyncio.to_thread(check_bwrap)
 
 
 class Command:
@@ -355,6 +532,12 @@ class Command:
             self.argv = argv
         self._orig_argv = argv
 
+    @classmethod
+    async def prepare(cls):
+        """Probe for bwrap without blocking the event loop. Commands created
+        afterwards reuse the result instead of running the probe themselves."""
+        await check_bwrap_async()
+
     async def run(self, input_data: t.Optional[bytes] = None) -> t.Tuple[bytes, bytes]:
         proc = await asyncio.create_subprocess_exec(
             *self.argv,
@@ -401,10 +584,10 @@ class Command:
         return proc.stdout, proc.stderr
 
     def __str__(self):
-        return " ".join(shlex.quote(a) for a in self._orig_argv)
+        return shlex.join(self._orig_argv)
 
 
-async def git_ls_remote(url: str) -> t.Dict[str, str]:
+async def _git_ls_remote(url: str) -> t.Dict[str, str]:
     git_cmd = Command(
         ["git", "ls-remote", "--exit-code", url],
         timeout=TIMEOUT_CONNECT,
@@ -424,11 +607,79 @@ async def git_ls_remote(url: str) -> t.Dict[str, str]:
     return {r: c for c, r in (line.split() for line in git_stdout.splitlines())}
 
 
+# In-flight or completed "git ls-remote" runs, by remote URL
+_GIT_LS_REMOTE_TASKS: t.Dict[str, asyncio.Task] = {}
+
+
+def _forget_failed_ls_remote(url: str, task: asyncio.Task):
+    if task.cancelled() or task.exception() is not None:
+        if _GIT_LS_REMOTE_TASKS.get(url) is task:
+            del _GIT_LS_REMOTE_TASKS[url]
+
+
+async def git_ls_remote(url: str) -> t.Dict[str, str]:
+    """List the refs of the remote at 'url'.
+
+    Each remote is only listed once per process: concurrent and subsequent
+    calls for the same URL share the result. Failures aren't remembered, so
+    a later call will try again."""
+    task = _GIT_LS_REMOTE_TASKS.get(url)
+    if task is None or (
+        not task.done() and task.get_loop() is not asyncio.get_running_loop()
+    ):
+        task = asyncio.create_task(_git_ls_remote(url))
+        task.add_done_callback(functools.partial(_forget_failed_ls_remote, url))
+        _GIT_LS_REMOTE_TASKS[url] = task
+    # Shield the shared task so that one caller being cancelled doesn't cancel
+    # it for everyone else waiting on the same remote
+    return dict(await asyncio.shield(task))
+
+
+_DESKTOP_GROUP = "Desktop Entry"
+# The desktop file at the top of an AppImage is usually a symlink into
+# usr/share/applications, so that has to be unpacked along with it
+_APPIMAGE_DESKTOP_FILES = ("*.desktop", "usr/share/applications/*.desktop")
+
+
+def _find_appimage_version(root: str) -> t.Tuple[bool, t.Optional[str]]:
+    # Only the top level of the squashfs root is of interest, so list it
+    # directly rather than globbing, and stop at the first desktop file
+    # that actually carries a version. Also report whether any desktop file
+    # could be read at all, since only then is the answer conclusive.
+    found_desktop = False
+    try:
+        entries = os.scandir(root)
+    except FileNotFoundError:
+        return found_desktop, None
+    with entries:
+        for entry in entries:
+            if not entry.name.endswith(".desktop"):
+                continue
+            # Desktop entry keys are case-sensitive and only use "="
+            desktop = configparser.ConfigParser(
+                delimiters=("=",), interpolation=None, strict=False
+            )
+            desktop.optionxform = str  # type: ignore
+            try:
+                if not desktop.read(entry.path, encoding="utf-8"):
+                    log.debug("Can't read %s", entry.name)
+                    continue
+            except (configparser.Error, UnicodeDecodeError) as err:
+                log.debug("Can't parse %s: %s", entry.name, err)
+                continue
+            found_desktop = True
+            try:
+                return found_desktop, desktop[_DESKTOP_GROUP]["X-AppImage-Version"]
+            except KeyError as err:
+                log.debug("No version in %s: %s", entry.name, err)
+    return found_desktop, None
+
+
 async def extract_appimage_version(appimg_io: t.IO):
     """
-    Saves 'data' to a temporary file with the given basename, executes it (in a sandbox)
-    with --appimage-extract to unpack it, and scrapes the version number out of the
-    first .desktop file it finds.
+    Unpacks the squashfs image embedded in the AppImage 'appimg_io' (in a sandbox)
+    and scrapes the version number out of the first .desktop file it finds that has
+    one.
     """
     assert appimg_io.name
 
@@ -436,35 +687,111 @@ async def extract_appimage_version(appimg_io: t.IO):
         header = ELFFile(appimg_io).header
         offset = header["e_shoff"] + header["e_shnum"] * header["e_shentsize"]
 
-        unsquashfs_cmd = Command(
-            ["unsquashfs", "-no-progress", "-offset", str(offset), appimg_io.name],
-            cwd=tmpdir,
-            allow_paths=[tmpdir, appimg_io.name],
-            stdout=None,
-        )
-        log.info("Running %s", unsquashfs_cmd)
-        await unsquashfs_cmd.run()
+        # Try unpacking just the desktop files first, and only unpack the
+        # whole image if none of them could be read (e.g. because they're
+        # symlinks into a part of the image that wasn't unpacked)
+        for dest, extract_files in [
+            ("desktop-root", _APPIMAGE_DESKTOP_FILES),
+            ("squashfs-root", ()),
+        ]:
+            unsquashfs_cmd = Command(
+                [
+                    "unsquashfs",
+                    "-no-progress",
+                    "-offset",
+                    str(offset),
+                    "-dest",
+                    dest,
+                    appimg_io.name,
+                    *extract_files,
+                ],
+                cwd=tmpdir,
+                allow_paths=[tmpdir, appimg_io.name],
+                stdout=None,
+            )
+            log.info("Running %s", unsquashfs_cmd)
+            await unsquashfs_cmd.run()
+
+            found_desktop, version = _find_appimage_version(os.path.join(tmpdir, dest))
+            if found_desktop:
+                return version
+
+    return None
+
+
+_AR_MAGIC = b"!<arch>\n"
+_AR_HEADER_SIZE = 60
+
 
-        for desktop in (Path(tmpdir) / "squashfs-root").glob("*.desktop"):
-            kf = GLib.KeyFile()
-            kf.load_from_file(str(desktop), GLib.KeyFileFlags.NONE)
-            return kf.get_string(GLib.KEY_FILE_DESKTOP_GROUP, "X-AppImage-Version")
+class _ArMemberReader(io.RawIOBase):
+    """Reads at most 'size' bytes from 'fileobj', so that tarfile can stream a
+    single ar member straight from the archive."""
+
+    def __init__(self, fileobj: t.IO[bytes], size: int):
+        super().__init__()
+        self._fileobj = fileobj
+        self._remaining = size
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._fileobj.read(size)
+        self._remaining -= len(data)
+        return data
+
+
+def _read_deb_control_version(deb_io: t.IO) -> t.Optional[str]:
+    """Find the Version field by walking the ar archive to the control.tar
+    member and streaming just that, without unpacking anything else.
+
+    Returns None if the archive uses a layout or compression that isn't
+    handled here."""
+    deb_io.seek(0)
+    if deb_io.read(len(_AR_MAGIC)) != _AR_MAGIC:
+        return None
+
+    while len(header := deb_io.read(_AR_HEADER_SIZE)) == _AR_HEADER_SIZE:
+        name = header[:16].rstrip(b" ").rstrip(b"/")
+        size = int(header[48:58])
+        if not name.startswith(b"control.tar"):
+            # Members are padded to an even size
+            deb_io.seek(size + size % 2, os.SEEK_CUR)
+            continue
+
+        try:
+            with tarfile.open(fileobj=_ArMemberReader(deb_io, size), mode="r|*") as tar:
+                for info in tar:
+                    if info.name.removeprefix("./") != "control":
+                        continue
+                    control = tar.extractfile(info)
+                    assert control is not None
+                    for line in control:
+                        if line.startswith(b"Version:"):
+                            return line[len(b"Version:") :].strip().decode()
+                    return None
+        except (tarfile.CompressionError, tarfile.ReadError) as err:
+            # e.g. zstd, which tarfile can't decompress
+            log.debug("Can't read %s: %s", name.decode(errors="replace"), err)
+        return None
+
+    return None
 
 
 def extract_deb_version(deb_io: t.IO):
+    version = _read_deb_control_version(deb_io)
+    if version is not None:
+        return version
+
     assert deb_io.name
+    deb_io.flush()
     control = apt_inst.DebFile(deb_io.name).control.extractdata("control")
     return apt_pkg.TagSection(control).get("Version")
 
 
-_GITHUB_URL_PATTERN = re.compile(
-    r"""
-        ^git@github.com:
-        (?P<org_repo>[^/]+/[^/]+?)
-        (?:\.git)?$
-    """,
-    re.VERBOSE,
-)
+_GITHUB_SSH_PREFIX = "git@github.com:"
 
 
 def parse_github_url(url):
@@ -475,11 +802,28 @@ def parse_github_url(url):
         o = urllib.parse.urlparse(url)
         return o.path[1:]
 
-    m = _GITHUB_URL_PATTERN.match(url)
-    if m:
-        return m.group("org_repo")
-    else:
-        raise ValueError(f"{url!r} doesn't look like a Git URL")
+    if url.startswith(_GITHUB_SSH_PREFIX):
+        org_repo = url[len(_GITHUB_SSH_PREFIX) :].removesuffix(".git")
+        org, sep, repo = org_repo.partition("/")
+        if org and sep and repo and "/" not in repo:
+            return org_repo
+
+    raise ValueError(f"{url!r} doesn't look like a Git URL")
+
+
+# Matches string literals (so that comment markers inside them are left
+# alone) as well as C-style comments
+_JSON_STRING_OR_COMMENT = re.compile(r'"(?:[^"\\]|\\.)*"|//[^\n]*|/\*.*?\*/', re.DOTALL)
+
+
+def _strip_json_comments(text: str) -> str:
+    def repl(match: re.Match) -> str:
+        token = match.group(0)
+        if token.startswith('"'):
+            return token
+        return " "
+
+    return _JSON_STRING_OR_COMMENT.sub(repl, text)
 
 
 def read_json_manifest(manifest_path: Path):
@@ -487,19 +831,23 @@ def read_json_manifest(manifest_path: Path):
     comments or multi-line strings (accepted by json-glib and hence
     flatpak-builder, but not Python's json module)."""
 
-    # Round-trip through json-glib to get rid of comments, multi-line
-    # strings, and any other invalid JSON
-    parser = Json.Parser()
+    with manifest_path.open("r", encoding="utf-8") as f:
+        text = f.read()
+
+    # Strip comments in a single pass and let the json module accept literal
+    # newlines inside strings, so the document is only parsed once
     try:
-        parser.load_from_file(str(manifest_path))
-    except GLib.Error as err:
-        if err.matches(GLib.file_error_quark(), GLib.FileError.NOENT):
-            raise FileNotFoundError(err.message) from err  # pylint: disable=no-member
-        raise
+        return json.loads(_strip_json_comments(text), strict=False)
+    except json.JSONDecodeError as err:
+        log.debug("Falling back to json-glib for %s: %s", manifest_path, err)
+
+    # Round-trip through json-glib to get rid of any other invalid JSON
+    parser = Json.Parser()
+    parser.load_from_data(text, -1)
     root = parser.get_root()
     clean_manifest = Json.to_string(root, False)
 
-    return json.loads(clean_manifest, object_pairs_hook=OrderedDict)
+    return json.loads(clean_manifest)
 
 
 _yaml = YAML()
@@ -552,21 +900,24 @@ def dump_manifest(contents: t.Dict, manifest_path: t.Union[Path, str]):
         except ValueError:
             log.warning("Ignoring invalid max_line_length %r", max_line_length)
 
-    # Determine trailing newline preference
-    newline: t.Optional[bool]
-    if "insert_final_newline" in conf:
-        newline = {"true": True, "false": False}.get(conf["insert_final_newline"])
-    else:
-        with manifest_path.open("r") as fp:
-            newline = _check_newline(fp)
-
-    with manifest_path.open("w", encoding="utf-8") as fp:
-        if manifest_path.suffix in (".yaml", ".yml"):
+    if manifest_path.suffix in (".yaml", ".yml"):
+        with manifest_path.open("w", encoding="utf-8") as fp:
             _yaml.dump(contents, fp)
+    else:
+        # Determine trailing newline preference; only the existing file can
+        # tell if editorconfig doesn't
+        newline: t.Optional[bool]
+        if "insert_final_newline" in conf:
+            newline = {"true": True, "false": False}.get(conf["insert_final_newline"])
         else:
-            json.dump(obj=contents, fp=fp, indent=indent)
-            if newline:
-                fp.write("\n")
+            newline = _check_newline(manifest_path)
+
+        # Serialise up front and write the result in one go, rather than
+        # streaming many small fragments through json.dump()
+        data = json.dumps(contents, indent=indent)
+        if newline:
+            data += "\n"
+        manifest_path.write_text(data, encoding="utf-8")
 
 
 def init_logging(level=logging.DEBUG):
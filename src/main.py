@@ -25,6 +25,7 @@
 import argparse
 import contextlib
 import getpass
+import itertools
 import json
 import logging
 import os
@@ -35,8 +36,6 @@ import asyncio
 from enum import IntFlag
 import typing as t
 
-from github import Github
-
 from .lib.utils import parse_github_url, init_logging
 from .lib.externaldata import ExternalData
 from . import manifest
@@ -183,27 +182,29 @@ def commit_message(changes: t.List[str]) -> str:
     if len(changes) == 1:
         return changes[0]
 
-    module_names = list(dict.fromkeys(list(i.split(":", 1)[0] for i in changes)))
+    module_names = list(dict.fromkeys(i.partition(":")[0] for i in changes))
 
     if len(module_names) == 1:
         return f"Update {module_names[0]} module"
 
-    for i in reversed(range(2, len(module_names) + 1)):
-        xs = module_names[: i - 1]
-        y = module_names[i - 1]
-        zs = module_names[i:]
+    # Length of ", ".join(module_names[:i]) for every i, so that candidate
+    # subjects can be measured without building each of them
+    joined_lens = list(
+        itertools.accumulate((len(m) + 2 for m in module_names), initial=-2)
+    )
+    prefix = "Update "
+    count = len(module_names)
 
-        if zs:
-            tail = f" and {len(zs)} more modules"
-            xs.append(y)
-        else:
-            tail = f" and {y} modules"
+    tail = f" and {module_names[-1]} modules"
+    if len(prefix) + joined_lens[count - 1] + len(tail) <= 70:
+        return prefix + ", ".join(module_names[:-1]) + tail
 
-        subject = "Update " + ", ".join(xs) + tail
-        if len(subject) <= 70:
-            return subject
+    for i in reversed(range(2, count)):
+        tail = f" and {count - i} more modules"
+        if len(prefix) + joined_lens[i] + len(tail) <= 70:
+            return prefix + ", ".join(module_names[:i]) + tail
 
-    return f"Update {len(module_names)} modules"
+    return f"Update {count} modules"
 
 
 def commit_changes(changes: t.List[str]) -> CommittedChanges:
@@ -318,6 +319,10 @@ def open_pr(
         log.error("GITHUB_TOKEN environment variable is not set")
         sys.exit(1)
 
+    # PyGithub takes a noticeable fraction of a second to import, and most runs
+    # never get as far as opening a pull request
+    from github import Github  # pylint: disable=import-outside-toplevel
+
     log.info("Opening pull request for branch %s", change.branch)
     g = Github(github_token)
     user = g.get_user()
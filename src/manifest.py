@@ -36,7 +36,7 @@ from .lib.externaldata import (
     BuilderModule,
     ExternalBase,
 )
-from .lib.utils import read_manifest, dump_manifest
+from .lib.utils import read_manifest, dump_manifest, Command
 from .lib.errors import (
     CheckerError,
     AppdataError,
@@ -393,6 +393,7 @@ class ManifestChecker:
             external_data = [d for d in external_data if d.type == filter_type]
 
         counter = self.TasksCounter(total=len(external_data))
+        await Command.prepare()
         async with aiohttp.ClientSession(
             raise_for_status=True,
             headers=HTTP_CLIENT_HEADERS,
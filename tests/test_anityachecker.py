@@ -1,11 +1,10 @@
 import os
 import unittest
-from distutils.version import LooseVersion
 
 from src.manifest import ManifestChecker
 from src.lib.externaldata import ExternalFile, ExternalGitRef
 from src.lib.checksums import MultiDigest
-from src.lib.utils import init_logging
+from src.lib.utils import init_logging, FallbackVersion
 
 TEST_MANIFEST = os.path.join(os.path.dirname(__file__), "org.flatpak.Flatpak.yml")
 
@@ -29,7 +28,7 @@ class TestAnityaChecker(unittest.IsolatedAsyncioTestCase):
                 )
                 self.assertIsNotNone(data.new_version.version)
                 self.assertGreater(
-                    LooseVersion(data.new_version.version), LooseVersion("2.76")
+                    FallbackVersion(data.new_version.version), FallbackVersion("2.76")
                 )
                 self.assertIsInstance(data.new_version.size, int)
                 self.assertGreater(data.new_version.size, 0)
@@ -50,7 +49,7 @@ class TestAnityaChecker(unittest.IsolatedAsyncioTestCase):
                 )
                 self.assertIsNotNone(data.new_version.version)
                 self.assertGreater(
-                    LooseVersion(data.new_version.version), LooseVersion("1.74.0")
+                    FallbackVersion(data.new_version.version), FallbackVersion("1.74.0")
                 )
                 self.assertIsInstance(data.new_version.size, int)
                 self.assertGreater(data.new_version.size, 0)
@@ -71,7 +70,7 @@ class TestAnityaChecker(unittest.IsolatedAsyncioTestCase):
                 )
                 self.assertIsNotNone(data.new_version.version)
                 self.assertEqual(
-                    LooseVersion(data.new_version.version), LooseVersion("1.10.1")
+                    FallbackVersion(data.new_version.version), FallbackVersion("1.10.1")
                 )
                 self.assertIsInstance(data.new_version.size, int)
                 self.assertGreater(data.new_version.size, 0)
@@ -94,7 +93,7 @@ class TestAnityaChecker(unittest.IsolatedAsyncioTestCase):
                 self.assertNotEqual(data.new_version.tag, data.current_version.tag)
                 self.assertIsNotNone(data.new_version.version)
                 self.assertGreater(
-                    LooseVersion(data.new_version.version), LooseVersion("2020.7")
+                    FallbackVersion(data.new_version.version), FallbackVersion("2020.7")
                 )
                 self.assertNotEqual(
                     data.new_version.commit, data.current_version.commit
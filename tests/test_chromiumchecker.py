@@ -1,7 +1,6 @@
 import logging
 import os
 import unittest
-from distutils.version import LooseVersion
 
 from src.manifest import ManifestChecker
 from src.lib.externaldata import (
@@ -11,7 +10,7 @@ from src.lib.externaldata import (
     ExternalGitRepo,
 )
 from src.lib.checksums import MultiDigest
-from src.lib.utils import init_logging
+from src.lib.utils import init_logging, FallbackVersion
 
 TEST_MANIFEST = os.path.join(os.path.dirname(__file__), "org.chromium.Chromium.yaml")
 
@@ -29,7 +28,8 @@ class TestChromiumChecker(unittest.IsolatedAsyncioTestCase):
             self.assertIsNotNone(data.new_version)
             self.assertIsNotNone(data.new_version.version)
             self.assertGreater(
-                LooseVersion(data.new_version.version), LooseVersion("100.0.4845.0")
+                FallbackVersion(data.new_version.version),
+                FallbackVersion("100.0.4845.0"),
             )
 
             if isinstance(data, ExternalData):
@@ -20,9 +20,8 @@
 
 import os
 import unittest
-from distutils.version import LooseVersion
 
-from src.lib.utils import init_logging
+from src.lib.utils import init_logging, FallbackVersion
 from src.manifest import ManifestChecker
 from src.lib.checksums import MultiDigest
 from src.checkers.gnomechecker import _is_stable
@@ -75,7 +74,7 @@ class TestGNOMEChecker(unittest.IsolatedAsyncioTestCase):
             elif data.filename == "pygobject-3.36.0.tar.xz":
                 self._test_include_unstable(data)
                 self.assertLess(
-                    LooseVersion(data.new_version.version), LooseVersion("3.38.0")
+                    FallbackVersion(data.new_version.version), FallbackVersion("3.38.0")
                 )
             elif data.filename == "alleyoop-0.9.8.tar.xz":
                 self._test_non_standard_version(data)
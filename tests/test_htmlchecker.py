@@ -23,11 +23,10 @@
 import os
 import base64
 import unittest
-from distutils.version import LooseVersion
 
 import aiohttp
 
-from src.lib.utils import init_logging
+from src.lib.utils import init_logging, FallbackVersion
 from src.manifest import ManifestChecker
 from src.lib.checksums import MultiDigest
 from src.checkers.htmlchecker import HTMLChecker
@@ -117,7 +116,7 @@ class TestHTMLChecker(unittest.IsolatedAsyncioTestCase):
         self.assertRegex(data.filename, r"libXScrnSaver-[\d\.-]+.tar.bz2")
         self.assertIsNotNone(data.new_version)
         self.assertLessEqual(
-            LooseVersion("1.2.2"), LooseVersion(data.new_version.version)
+            FallbackVersion("1.2.2"), FallbackVersion(data.new_version.version)
         )
         self.assertRegex(
             data.new_version.url,
@@ -135,7 +134,7 @@ class TestHTMLChecker(unittest.IsolatedAsyncioTestCase):
         self.assertRegex(data.filename, r"qrupdate-[\d\.-]+.tar.gz")
         self.assertIsNotNone(data.new_version)
         self.assertLessEqual(
-            LooseVersion("1.1.0"), LooseVersion(data.new_version.version)
+            FallbackVersion("1.1.0"), FallbackVersion(data.new_version.version)
         )
         self.assertRegex(
             data.new_version.url,
@@ -118,3 +118,35 @@ class TestForceForkTristate(unittest.TestCase):
     def test_both_fork_args(self):
         with self.assertRaises(SystemExit):
             main.parse_cli_args(["--always-fork", "--never-fork", TEST_MANIFEST])
+
+
+class TestCommitMessage(unittest.TestCase):
+    def test_single_change(self):
+        self.assertEqual(
+            main.commit_message(["foo: Update foo.tar.gz to 1.0"]),
+            "foo: Update foo.tar.gz to 1.0",
+        )
+
+    def test_single_module(self):
+        self.assertEqual(
+            main.commit_message(["foo: Update a to 1.0", "foo: Update b to 2.0"]),
+            "Update foo module",
+        )
+
+    def test_modules(self):
+        self.assertEqual(
+            main.commit_message(["foo: Update a", "bar: Update b", "baz: Update c"]),
+            "Update foo, bar and baz modules",
+        )
+
+    def test_many_modules(self):
+        names = [f"module-{i}" for i in range(12)]
+        self.assertEqual(
+            main.commit_message([f"{n}: Update" for n in names]),
+            "Update module-0, module-1, module-2, module-3 and 8 more modules",
+        )
+        names = [f"module-with-a-very-very-very-very-long-name-{i}" for i in range(3)]
+        self.assertEqual(
+            main.commit_message([f"{n}: Update" for n in names]),
+            "Update 3 modules",
+        )
@@ -45,24 +45,20 @@ class TestNewlinePreservation(unittest.TestCase):
             fp = os.path.join(d, "trailingnewline.json")
             with open(fp, "w") as f:
                 f.write(MANIFEST_WITH_NEWLINE)
-            with open(fp, "r") as f:
-                self.assertTrue(_check_newline(f))
+            self.assertTrue(_check_newline(fp))
             manifest = read_manifest(fp)
             dump_manifest(manifest, fp)
-            with open(fp, "r") as f:
-                self.assertTrue(_check_newline(f))
+            self.assertTrue(_check_newline(fp))
 
     def test_no_newline(self):
         with tempfile.TemporaryDirectory() as d:
             fp = os.path.join(d, "notrailingnewline.json")
             with open(fp, "w") as f:
                 f.write(MANIFEST_NO_NEWLINE)
-            with open(fp, "r") as f:
-                self.assertFalse(_check_newline(f))
+            self.assertFalse(_check_newline(fp))
             manifest = read_manifest(fp)
             dump_manifest(manifest, fp)
-            with open(fp, "r") as f:
-                self.assertFalse(_check_newline(f))
+            self.assertFalse(_check_newline(fp))
 
 
 if __name__ == "__main__":
@@ -17,6 +17,7 @@
 # You should have received a copy of the GNU General Public License along
 # with this program; if not, write to the Free Software Foundation, Inc.,
 # 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+import asyncio
 import unittest
 import subprocess
 from datetime import datetime, timezone
@@ -26,20 +27,30 @@ import re
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from textwrap import dedent
+from unittest.mock import patch
 
 import aiohttp
 
-from src.lib.errors import CheckerFetchError
+from src.lib.errors import CheckerFetchError, CheckerQueryError
 from src.lib.utils import (
     parse_github_url,
     strip_query,
     filter_versions,
     filter_versioned_items,
     FallbackVersion,
+    loose_version_parts,
     parse_date_header,
     get_extra_data_info_from_url,
     Command,
     dump_manifest,
+    read_json_manifest,
+    extract_deb_version,
+    _read_deb_control_version,
+    _combine_patterns,
+    _find_appimage_version,
+    _GIT_LS_REMOTE_TASKS,
+    _git_ls_remote,
+    git_ls_remote,
 )
 
 
@@ -77,6 +88,11 @@ class TestStripQuery(unittest.TestCase):
         expected = url
         self.assertEqual(strip_query(url), expected)
 
+    def test_preserve_encoding(self):
+        url = "https://example.com/f.tar.gz?_ga=1&X-Sig=a%2Bb%7E&empty="
+        expected = "https://example.com/f.tar.gz?X-Sig=a%2Bb%7E&empty="
+        self.assertEqual(strip_query(url), expected)
+
 
 class TestCommand(unittest.IsolatedAsyncioTestCase):
     @contextmanager
@@ -156,6 +172,12 @@ class TestVersionFilter(unittest.TestCase):
             [("d", "1.0"), ("c", "1.1"), ("a", "1.3")],
         )
 
+    def test_fallback(self):
+        self.assertLess(FallbackVersion("1.0a1"), FallbackVersion("1.0"))
+        self.assertEqual(FallbackVersion("1.0"), FallbackVersion("1.0.0"))
+        self.assertLess(FallbackVersion("1.9"), FallbackVersion("1.10rc1"))
+        self.assertEqual(loose_version_parts("1.2rc3"), (1, 2, "rc", 3))
+
 
 class TestParseHTTPDate(unittest.TestCase):
     def test_parse_valid(self):
@@ -186,6 +208,30 @@ class TestParseHTTPDate(unittest.TestCase):
         self.assertIsNotNone(parse_date_header("some broken string"))
 
 
+class TestCombinePatterns(unittest.TestCase):
+    def test_combine(self):
+        patterns = (re.compile(r"text/html"), re.compile(r"text/plain"))
+        combined = _combine_patterns(patterns)
+        self.assertIsNotNone(combined)
+        self.assertIsNotNone(combined.match("text/plain; charset=utf-8"))
+        self.assertIsNone(combined.match("application/zip"))
+
+    def test_mixed_flags(self):
+        patterns = (re.compile(r"text/html"), re.compile(r"TEXT/PLAIN", re.I))
+        self.assertIsNone(_combine_patterns(patterns))
+
+    def test_inline_flags(self):
+        for patterns in [
+            (re.compile(r"(?i)text/html"),),
+            (re.compile(r"(?i)text/html"), re.compile(r"(?i)text/plain")),
+        ]:
+            with self.subTest(patterns=patterns):
+                self.assertIsNone(_combine_patterns(patterns))
+
+    def test_empty(self):
+        self.assertIsNone(_combine_patterns(()))
+
+
 class TestDownload(unittest.IsolatedAsyncioTestCase):
     _CONTENT_TYPE = "application/x-fedc-test"
     http: aiohttp.ClientSession
@@ -228,6 +274,33 @@ class TestDownload(unittest.IsolatedAsyncioTestCase):
             )
 
 
+class TestReadJsonManifest(unittest.TestCase):
+    def test_comments_and_multiline_strings(self):
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "manifest.json"
+            path.write_text(
+                dedent(
+                    """\
+                    {
+                        /* A block comment */
+                        "id": "org.example.App", // A line comment
+                        "url": "https://example.com/a//b/*c*/",
+                        "command": "multi
+                    line"
+                    }
+                    """
+                )
+            )
+            self.assertEqual(
+                read_json_manifest(path),
+                {
+                    "id": "org.example.App",
+                    "url": "https://example.com/a//b/*c*/",
+                    "command": "multi\nline",
+                },
+            )
+
+
 EDITORCONFIG_SAMPLE_DATA = {"first": 1, "second": [2, 3]}
 EDITORCONFIG_STYLES = [
     # 2-space with newline
@@ -313,5 +386,156 @@ class TestDumpManifest(unittest.TestCase):
             self.assertEqual(path.read_text(), expected_data)
 
 
+class TestExtractDebVersion(unittest.TestCase):
+    CONTROL = dedent(
+        """\
+        Package: fedc-test
+        Version: 1:2.3-4
+        Architecture: all
+        Maintainer: Test <test@localhost>
+        Description: test package
+        """
+    )
+
+    def _build_deb(self, tmpdir: str, compression: str) -> Path:
+        pkgdir = Path(tmpdir) / "pkg"
+        (pkgdir / "DEBIAN").mkdir(parents=True, exist_ok=True)
+        (pkgdir / "DEBIAN" / "control").write_text(self.CONTROL)
+        deb = Path(tmpdir) / f"{compression}.deb"
+        subprocess.run(
+            ["dpkg-deb", f"-Z{compression}", "--build", str(pkgdir), str(deb)],
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        return deb
+
+    def test_extract(self):
+        with TemporaryDirectory() as tmpdir:
+            for compression in ["gzip", "xz", "none"]:
+                with self.subTest(compression=compression):
+                    deb = self._build_deb(tmpdir, compression)
+                    with deb.open("rb") as deb_io:
+                        self.assertEqual(extract_deb_version(deb_io), "1:2.3-4")
+                        self.assertEqual(_read_deb_control_version(deb_io), "1:2.3-4")
+
+    def test_zstd_fallback(self):
+        with TemporaryDirectory() as tmpdir:
+            deb = self._build_deb(tmpdir, "zstd")
+            with deb.open("rb") as deb_io:
+                self.assertIsNone(_read_deb_control_version(deb_io))
+                self.assertEqual(extract_deb_version(deb_io), "1:2.3-4")
+
+
+class TestFindAppImageVersion(unittest.TestCase):
+    def test_find(self):
+        with TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            # Keys are case-sensitive, so this one doesn't count
+            (root / "unversioned.desktop").write_text(
+                dedent(
+                    """\
+                    [Desktop Entry]
+                    Name=Unversioned
+                    x-appimage-version=0.0.1
+                    """
+                )
+            )
+            (root / "versioned.desktop").write_text(
+                dedent(
+                    """\
+                    [Desktop Entry]
+                    Name=Versioned
+                    Exec=versioned %U
+                    X-AppImage-Version=1.2.3
+                    """
+                )
+            )
+            (root / "dangling.desktop").symlink_to(root / "missing.desktop")
+            (root / "README").write_text("X-AppImage-Version=9.9.9\n")
+            self.assertEqual(_find_appimage_version(tmpdir), (True, "1.2.3"))
+
+    def test_no_version(self):
+        with TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "app.desktop").write_text("[Desktop Entry]\nName=App\n")
+            (root / "dangling.desktop").symlink_to(root / "missing.desktop")
+            # A desktop file was read, so there's no point looking any further
+            self.assertEqual(_find_appimage_version(tmpdir), (True, None))
+
+    def test_nothing_readable(self):
+        with TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "dangling.desktop").symlink_to(root / "missing.desktop")
+            (root / "binary.desktop").write_bytes(b"\xff\xfe")
+            self.assertEqual(_find_appimage_version(tmpdir), (False, None))
+
+    def test_missing_root(self):
+        with TemporaryDirectory() as tmpdir:
+            missing = str(Path(tmpdir) / "missing")
+            self.assertEqual(_find_appimage_version(missing), (False, None))
+
+
+# The sandbox doesn't expose temporary directories, so run git unsandboxed
+@patch("src.lib.utils._BWRAP_AVAILABLE", False)
+class TestGitLsRemote(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        _GIT_LS_REMOTE_TASKS.clear()
+        self.addCleanup(_GIT_LS_REMOTE_TASKS.clear)
+        self._tmpdir = TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        self.tmpdir = Path(self._tmpdir.name)
+
+    def _make_repo(self, path: Path) -> str:
+        def git(*args, **kwargs):
+            proc = subprocess.run(
+                ["git", "-C", str(path), *args],
+                check=True,
+                stdout=subprocess.PIPE,
+                text=True,
+                **kwargs,
+            )
+            return proc.stdout.strip()
+
+        subprocess.run(
+            ["git", "init", "--quiet", "--bare", str(path)],
+            check=True,
+        )
+        tree = git("mktree", input="")
+        commit = git(
+            "-c",
+            "user.name=Test",
+            "-c",
+            "user.email=test@localhost",
+            "commit-tree",
+            tree,
+            "-m",
+            "Initial commit",
+        )
+        git("update-ref", "refs/heads/main", commit)
+        return commit
+
+    async def test_shared(self):
+        url = str(self.tmpdir / "repo.git")
+        commit = self._make_repo(Path(url))
+        with patch("src.lib.utils._git_ls_remote", wraps=_git_ls_remote) as ls_remote:
+            first, second = await asyncio.gather(git_ls_remote(url), git_ls_remote(url))
+        ls_remote.assert_called_once_with(url)
+        self.assertEqual(first["refs/heads/main"], commit)
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        first.clear()
+        self.assertEqual(second["refs/heads/main"], commit)
+        self.assertEqual((await git_ls_remote(url))["refs/heads/main"], commit)
+
+    async def test_failure_not_cached(self):
+        url = str(self.tmpdir / "repo.git")
+        with self.assertRaises(CheckerQueryError):
+            await git_ls_remote(url)
+        self.assertNotIn(url, _GIT_LS_REMOTE_TASKS)
+
+        commit = self._make_repo(Path(url))
+        self.assertEqual((await git_ls_remote(url))["refs/heads/main"], commit)
+
+
 if __name__ == "__main__":
     unittest.main()